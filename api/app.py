@@ -76,6 +76,7 @@
 
 
 import os
+import json
 import shutil
 import uuid
 import time
@@ -85,7 +86,8 @@ from werkzeug.utils import secure_filename
 
 from api.line_parser import process_folder             # STEP 1
 from api.heuristic_labeller import process_unlabelled_csv        # STEP 2
-from api.main import run_pipeline                  # STEP 3
+from api.main import run_pipeline, generate_final_output, EMBEDDING_MODEL, TOP_K   # STEP 3
+from api.result_cache import ResultCache, file_sha256, make_cache_key, remap_documents
 
 ALLOWED_EXTENSIONS = {'pdf'}
 
@@ -95,6 +97,8 @@ CORS(app, resources={r"/upload": {"origins": "*"}})
 BASE_UPLOAD_FOLDER = './uploads'
 os.makedirs(BASE_UPLOAD_FOLDER, exist_ok=True)
 
+result_cache = ResultCache()
+
 # Serve React frontend
 @app.route("/")
 @app.route("/index.html")
@@ -110,6 +114,11 @@ def serve_react_catchall(path):
         return app.send_static_file("index.html")
 
 
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify(result_cache.stats())
+
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -135,13 +144,35 @@ def upload_files():
 
     try:
         # Step 1: Save PDFs
+        pdf_hashes = {}  # file name -> content hash
         for file in files:
             if allowed_file(file.filename):
                 filename = secure_filename(file.filename)
-                file.save(os.path.join(temp_dir, filename))
+                filepath = os.path.join(temp_dir, filename)
+                file.save(filepath)
+                pdf_hashes[filename] = file_sha256(filepath)
             else:
                 return jsonify({"error": f"File {file.filename} is not allowed."}), 400
 
+        # Identical corpus + persona + job already answered → skip the pipeline
+        cache_key = make_cache_key(pdf_hashes.values(), persona, job, EMBEDDING_MODEL, TOP_K)
+        output_json = os.path.join(temp_dir, "summary.json")
+        start_time = time.time()
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            input_docs, sections, subsections = remap_documents(cached, pdf_hashes)
+            generate_final_output(input_docs, persona, job, sections, subsections, output_json)
+            elapsed_time = time.time() - start_time
+
+            with open(output_json, 'r', encoding='utf-8') as f:
+                summary = f.read()
+
+            return jsonify({
+                "summary": summary,
+                "execution_time_seconds": round(elapsed_time, 2),
+                "cache": "hit"
+            })
+
         # Step 2: Extract headings → unlabelled CSV
         unlabelled_csv = os.path.join(temp_dir, "unlabelled_data.csv")
         process_folder(temp_dir, unlabelled_csv)
@@ -151,7 +182,6 @@ def upload_files():
         process_unlabelled_csv(unlabelled_csv, labelled_csv)
 
         # Step 4: Summarize → JSON dict
-        output_json = os.path.join(temp_dir, "summary.json")
         start_time = time.time()
         run_pipeline(csv_path=labelled_csv, persona=persona, job=job, output_json_path=output_json)
         elapsed_time = time.time() - start_time
@@ -160,9 +190,22 @@ def upload_files():
         with open(output_json, 'r', encoding='utf-8') as f:
             summary = f.read()
 
+        # Caching is best-effort: a failed write must not fail a finished run
+        try:
+            result = json.loads(summary)
+            result_cache.put(cache_key, {
+                "documents": pdf_hashes,
+                "input_documents": result["metadata"]["input_documents"],
+                "extracted_sections": result["extracted_sections"],
+                "subsection_analysis": result["subsection_analysis"]
+            })
+        except Exception as cache_error:
+            print(f"[Cache Error] Failed to store result {cache_key}: {cache_error}")
+
         return jsonify({
             "summary": summary,
-            "execution_time_seconds": round(elapsed_time, 2)
+            "execution_time_seconds": round(elapsed_time, 2),
+            "cache": "miss"
         })
 
     except Exception as e:
@@ -0,0 +1,171 @@
+import re
+import hashlib
+import pandas as pd
+
+### CONFIGURATION ###
+BOILERPLATE_PAGE_RATIO = 0.5   # a top/bottom line repeated on >= this share of a PDF's pages is a header/footer
+EDGE_LINES = 2                 # only the first/last N lines of a page can be headers, footers or page numbers
+SIMHASH_BITS = 64
+SIMHASH_MAX_DISTANCE = 3       # max Hamming distance for two chunks to be near-duplicate candidates
+SIMHASH_MIN_TOKENS = 8         # shorter texts only get exact-match dedup (simhash is unreliable on them)
+NEAR_DUP_MIN_JACCARD = 0.8     # token-set Jaccard a simhash candidate must reach to be merged
+
+PAGE_NUMBER_RE = re.compile(r'^(page\s*)?#+(\s*(of|/)\s*#+)?$')
+PROTECTED_LABELS = {'title'}
+HEADING_LABELS = {'h1', 'h2', 'h3', 'H1', 'H2', 'H3'}  # kept only when set larger than body text
+
+
+def normalize_text(text: str, fold_digits: bool = False) -> str:
+    """
+    Canonical form used for hashing: lowercase, whitespace collapsed.
+    With fold_digits, digit runs become '#' so "Page 3 of 12" and "Page 4 of 12" compare equal.
+    """
+    text = str(text).lower()
+    if fold_digits:
+        text = re.sub(r'\d+', '#', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.blake2b(normalize_text(text).encode('utf-8'), digest_size=16).hexdigest()
+
+
+### STEP 1: Header / Footer Removal ###
+def drop_boilerplate_lines(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Removes running headers, footers and page-number lines from a line-level DataFrame.
+
+    A line is a candidate when it sits in the top or bottom band of the page (the
+    `position_top` / `position_bottom` features from the line parser) and is one of the first
+    or last EDGE_LINES lines on its page. A candidate is dropped when its digit-folded text
+    repeats on at least BOILERPLATE_PAGE_RATIO of the pages of the same PDF, or when it looks
+    like a page number and that pattern recurs on at least two pages. Title lines are always
+    kept; heading lines are kept only when their font is larger than the PDF's modal (body)
+    font size, since the labeller's title-case rule also tags small running headers as headings.
+
+    Args:
+        df (pd.DataFrame): Line-level data with 'text', 'page' and 'source_pdf' columns.
+
+    Returns:
+        pd.DataFrame: The DataFrame without boilerplate rows.
+    """
+    if df.empty or not {'position_top', 'position_bottom'}.issubset(df.columns):
+        return df
+
+    norm = df['text'].astype(str).map(lambda t: normalize_text(t, fold_digits=True))
+    in_margin = df['position_top'].fillna(False).astype(bool) | df['position_bottom'].fillna(False).astype(bool)
+
+    # The margin features cover half the page, so also require the line to be at the page edge
+    if 'y0' in df.columns:
+        by_page = df.groupby(['source_pdf', 'page'])['y0']
+        from_top = by_page.rank(method='first', ascending=True)
+        from_bottom = by_page.rank(method='first', ascending=False)
+        in_margin &= (from_top <= EDGE_LINES) | (from_bottom <= EDGE_LINES)
+
+    pages_per_doc = df.groupby('source_pdf')['page'].transform('nunique')
+    margin = df[in_margin].assign(_norm=norm[in_margin])
+    repeat_pages = margin.groupby(['source_pdf', '_norm'])['page'].transform('nunique')
+    repeat_pages = repeat_pages.reindex(df.index, fill_value=0)
+
+    is_page_number = in_margin & norm.str.match(PAGE_NUMBER_RE) & (repeat_pages >= 2)
+    is_repeated = (
+        in_margin
+        & (pages_per_doc >= 2)
+        & (repeat_pages >= 2)
+        & (repeat_pages >= pages_per_doc * BOILERPLATE_PAGE_RATIO)
+    )
+
+    boilerplate = is_page_number | is_repeated
+    if 'label' in df.columns:
+        protected = df['label'].isin(PROTECTED_LABELS)
+        if 'font_size' in df.columns:
+            body_font = df.groupby('source_pdf')['font_size'].transform(lambda s: s.mode().iloc[0])
+            protected |= df['label'].isin(HEADING_LABELS) & (df['font_size'] > body_font)
+        boilerplate &= ~protected
+
+    return df[~boilerplate]
+
+
+### STEP 2: Duplicate / Near-Duplicate Chunk Grouping ###
+def simhash(text: str, bits: int = SIMHASH_BITS) -> int:
+    weights = [0] * bits
+    for token in normalize_text(text).split():
+        h = int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=bits // 8).digest(), 'big')
+        for i in range(bits):
+            weights[i] += 1 if (h >> i) & 1 else -1
+    return sum(1 << i for i in range(bits) if weights[i] > 0)
+
+
+def is_near_duplicate(a: str, b: str) -> bool:
+    """
+    Confirms a simhash candidate: the texts must contain exactly the same numbers and
+    share at least NEAR_DUP_MIN_JACCARD of their tokens. "Day 3 ... 45 euros" and
+    "Day 4 ... 80 euros" therefore never merge, however similar the rest is.
+    """
+    tokens_a = set(normalize_text(a).split())
+    tokens_b = set(normalize_text(b).split())
+    numbers_a = sorted(re.findall(r'\d+', a))
+    numbers_b = sorted(re.findall(r'\d+', b))
+    if numbers_a != numbers_b:
+        return False
+    union = tokens_a | tokens_b
+    return bool(union) and len(tokens_a & tokens_b) / len(union) >= NEAR_DUP_MIN_JACCARD
+
+
+def group_duplicate_texts(texts):
+    """
+    Groups texts that are exact duplicates (after normalization) or near-duplicates
+    (SimHash within SIMHASH_MAX_DISTANCE bits, confirmed by `is_near_duplicate`).
+    Groups decide which texts share an embedding; they are not used to hide results.
+
+    Candidates are found by splitting each fingerprint into SIMHASH_MAX_DISTANCE + 1 bands:
+    two fingerprints within that distance must agree on at least one band exactly.
+
+    Args:
+        texts (list[str]): Texts in their original order.
+
+    Returns:
+        tuple[list[int], list[int]]: (group id per text, index of each group's representative text).
+        The representative is the first occurrence of the group.
+    """
+    num_bands = SIMHASH_MAX_DISTANCE + 1
+    band_bits = SIMHASH_BITS // num_bands
+    band_mask = (1 << band_bits) - 1
+
+    groups = []
+    representatives = []
+    exact = {}
+    fingerprints = {}   # group id -> simhash of its representative
+    bands = {}          # (band index, band value) -> [group ids]
+
+    for idx, text in enumerate(texts):
+        key = text_hash(text)
+        if key in exact:
+            groups.append(exact[key])
+            continue
+
+        group = None
+        fp = None
+        if len(normalize_text(text).split()) >= SIMHASH_MIN_TOKENS:
+            fp = simhash(text)
+            for b in range(num_bands):
+                for candidate in bands.get((b, (fp >> (b * band_bits)) & band_mask), []):
+                    if (bin(fp ^ fingerprints[candidate]).count('1') <= SIMHASH_MAX_DISTANCE
+                            and is_near_duplicate(text, texts[representatives[candidate]])):
+                        group = candidate
+                        break
+                if group is not None:
+                    break
+
+        if group is None:
+            group = len(representatives)
+            representatives.append(idx)
+            if fp is not None:
+                fingerprints[group] = fp
+                for b in range(num_bands):
+                    bands.setdefault((b, (fp >> (b * band_bits)) & band_mask), []).append(group)
+
+        exact[key] = group
+        groups.append(group)
+
+    return groups, representatives
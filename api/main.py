@@ -9,6 +9,8 @@ from joblib import Parallel, delayed
 from math import ceil
 import time
 
+from api.dedup import drop_boilerplate_lines, group_duplicate_texts, text_hash
+
 ### CONFIGURATION ###
 EMBEDDING_MODEL = "intfloat/multilingual-e5-small"  # ~500MB model
 TOP_K = 5  # number of top results for section and subsection
@@ -20,6 +22,11 @@ def build_chunks_from_csv(csv_path):
     # Ensure these columns exist
     assert {'text', 'label', 'page', 'source_pdf'}.issubset(df.columns), "Missing required columns"
 
+    # Drop running headers, footers and page numbers before they get chunked
+    total_lines = len(df)
+    df = drop_boilerplate_lines(df)
+    print(f"boilerplate lines removed : {total_lines - len(df)}")
+
     chunks = []
     current_chunk = ""
     current_label = None
@@ -83,7 +90,12 @@ def embed_chunks_and_save(chunks, out_path):
     model = SentenceTransformer(EMBEDDING_MODEL)
     texts = [chunk['text'] for chunk in chunks]
     #best = benchmark_batch_sizes(texts=texts)
-    embeddings = model.encode(texts, show_progress_bar=True)
+
+    # Encode each unique / near-duplicate group once and share the vector with every occurrence
+    groups, representatives = group_duplicate_texts(texts)
+    print(f"unique texts to embed : {len(representatives)} of {len(texts)}")
+    unique_embeddings = model.encode([texts[i] for i in representatives], show_progress_bar=True)
+    embeddings = [unique_embeddings[g] for g in groups]
 
     # Split into N batches (N = CPU cores)
     #num_cores = 8
@@ -98,6 +110,7 @@ def embed_chunks_and_save(chunks, out_path):
 
     for i, emb in enumerate(embeddings):
         chunks[i]['embedding'] = emb.tolist()
+        chunks[i]['text_hash'] = text_hash(chunks[i]['text'])
 
     with open(out_path, 'wb') as f:
         pickle.dump(chunks, f)
@@ -129,7 +142,8 @@ def retrieve_top_chunks(pkl_path, persona, job_to_be_done, top_k=TOP_K):
     top_sections = []
     top_subsections = []
     used_sections = set()
-    
+    used_texts = set()
+
     for chunk in sorted_chunks:
         if len(top_sections) < top_k and chunk['label'] in ['title', 'H1', 'H2'] and chunk['text'] not in used_sections:
             top_sections.append({
@@ -140,12 +154,14 @@ def retrieve_top_chunks(pkl_path, persona, job_to_be_done, top_k=TOP_K):
             })
             used_sections.add(chunk['text'])
 
-        elif len(top_subsections) < top_k and chunk['label'] not in ['title', 'H1', 'H2']:
+        elif len(top_subsections) < top_k and chunk['label'] not in ['title', 'H1', 'H2'] and chunk.get('text_hash') not in used_texts:
             top_subsections.append({
                 "document": chunk['document'],
                 "refined_text": chunk['text'],
                 "page_number": int(chunk['page'])
             })
+            if 'text_hash' in chunk:
+                used_texts.add(chunk['text_hash'])
 
         if len(top_sections) >= top_k and len(top_subsections) >= top_k:
             break
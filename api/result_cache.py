@@ -0,0 +1,203 @@
+import os
+import re
+import json
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict, defaultdict
+
+### CONFIGURATION ###
+CACHE_DIR = os.environ.get("RESULT_CACHE_DIR", "./cache/results")
+MEMORY_CAPACITY = int(os.environ.get("RESULT_CACHE_SIZE", "128"))       # max entries kept in memory
+DISK_CAPACITY = int(os.environ.get("RESULT_CACHE_DISK_SIZE", "1024"))   # max entry files kept on disk, oldest (mtime) pruned first
+CACHE_VERSION = 2  # bump when pipeline changes would alter results for the same inputs
+
+ENTRY_LISTS = ("input_documents", "extracted_sections", "subsection_analysis")
+
+
+def file_sha256(path, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def normalize_query(text: str) -> str:
+    return re.sub(r'\s+', ' ', str(text)).strip().casefold()
+
+
+def make_cache_key(pdf_hashes, persona, job, model_name, top_k):
+    """
+    Builds the cache key for a request.
+
+    Args:
+        pdf_hashes (Iterable[str]): Content hashes of the uploaded PDFs (order does not matter,
+            but the same content uploaded twice counts twice).
+        persona (str): User persona, normalized for case and whitespace.
+        job (str): Job to be done, normalized for case and whitespace.
+        model_name (str): Embedding model used by the pipeline.
+        top_k (int): Number of sections/subsections returned.
+
+    Returns:
+        str: Hex digest identifying the request.
+    """
+    payload = json.dumps({
+        "version": CACHE_VERSION,
+        "pdfs": sorted(pdf_hashes),
+        "persona": normalize_query(persona),
+        "job": normalize_query(job),
+        "model": model_name,
+        "top_k": top_k
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def is_valid_entry(entry) -> bool:
+    if not isinstance(entry, dict) or not isinstance(entry.get("documents"), dict):
+        return False
+    if not all(isinstance(entry.get(name), list) for name in ENTRY_LISTS):
+        return False
+    return all(
+        isinstance(item, dict) and "document" in item
+        for name in ("extracted_sections", "subsection_analysis")
+        for item in entry[name]
+    )
+
+
+class ResultCache:
+    """
+    Two-tier cache of pipeline results: a bounded in-memory LRU in front of one JSON file
+    per key on disk, pruned to `disk_capacity` files by modification time.
+
+    Entries hold 'input_documents', 'extracted_sections', 'subsection_analysis' and a
+    'documents' mapping of file name -> PDF content hash at the time the result was computed.
+
+    Stats are per instance, so under a multi-worker server (e.g. gunicorn with several
+    workers) each worker reports only its own hits and misses.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, capacity=MEMORY_CAPACITY, disk_capacity=DISK_CAPACITY):
+        self.cache_dir = cache_dir
+        self.capacity = capacity
+        self.disk_capacity = disk_capacity
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError as e:
+            # Without a disk tier every put fails; callers treat that as best-effort
+            print(f"[Cache Error] Cannot create {self.cache_dir}: {e}")
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def _prune_disk(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.json'):
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.disk_capacity)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return self._memory[key]
+
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if not is_valid_entry(entry):
+                raise ValueError("malformed cache entry")
+            os.utime(path)  # keep recently used entries from being pruned
+        except FileNotFoundError:
+            entry = None
+        except Exception as e:
+            print(f"[Cache Error] Discarding {path}: {e}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._remember(key, entry)
+            self._stats["disk_hits"] += 1
+        return entry
+
+    def put(self, key, entry):
+        # Write to a temp file and rename so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            self._remember(key, entry)
+            self._stats["stores"] += 1
+        self._prune_disk()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+
+def remap_documents(entry, current_docs):
+    """
+    Rewrites document names in a cached entry to the names used in the current upload,
+    matching files by content hash. Several files with the same content are paired up
+    in sorted name order.
+
+    Args:
+        entry (dict): Cached entry (see `ResultCache`).
+        current_docs (dict): File name -> PDF content hash for the current upload.
+
+    Returns:
+        tuple[list, list, list]: (input_documents, sections, subsections) with updated names.
+    """
+    old_by_hash = defaultdict(list)
+    new_by_hash = defaultdict(list)
+    for name, h in entry["documents"].items():
+        old_by_hash[h].append(name)
+    for name, h in current_docs.items():
+        new_by_hash[h].append(name)
+
+    rename = {}
+    for h, old_names in old_by_hash.items():
+        rename.update(zip(sorted(old_names), sorted(new_by_hash.get(h, []))))
+
+    input_docs = sorted(rename.get(d, d) for d in entry["input_documents"])
+    sections = [dict(s, document=rename.get(s["document"], s["document"])) for s in entry["extracted_sections"]]
+    subsections = [dict(s, document=rename.get(s["document"], s["document"])) for s in entry["subsection_analysis"]]
+    return input_docs, sections, subsections
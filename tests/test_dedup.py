@@ -0,0 +1,146 @@
+import random
+
+import pandas as pd
+
+from api.dedup import drop_boilerplate_lines, group_duplicate_texts
+from api.heuristic_labeller import assign_labels
+
+PAGE_HEIGHT = 800
+BODY_FONT = 10
+
+
+def make_lines(pages):
+    """Builds line-parser style rows from {page: [(text, y0, label[, font_size]), ...]}."""
+    rows = []
+    for page, lines in pages.items():
+        for text, y0, label, *font in lines:
+            center_y = y0 + 5
+            words = text.split()
+            rows.append({
+                'source_pdf': 'doc.pdf',
+                'label': label,
+                'text': text,
+                'page': page,
+                'font_size': font[0] if font else BODY_FONT,
+                'bold_ratio': 0,
+                'y0': y0,
+                'position_top': center_y < PAGE_HEIGHT * 0.25,
+                'position_bottom': center_y > PAGE_HEIGHT * 0.75,
+                'ends_with_colon': text.endswith(':'),
+                'bullet_char': False,
+                'text_length': len(text),
+                'num_words': len(words),
+                'capitalized_words_ratio': round(sum(1 for w in words if w[:1].isupper()) / len(words), 2),
+                'is_first_page': page == 1,
+            })
+    return pd.DataFrame(rows)
+
+
+def body(page):
+    return [
+        (f"Body paragraph one on page {page}.", 300, 'paragraph'),
+        (f"Body paragraph two on page {page}.", 400, 'paragraph'),
+        (f"Body paragraph three on page {page}.", 500, 'paragraph'),
+    ]
+
+
+def kept_texts(df):
+    return set(drop_boilerplate_lines(df)['text'])
+
+
+### Header / Footer Removal ###
+def test_repeated_header_is_dropped():
+    pages = {p: [("ACME Corp Annual Report", 20, 'paragraph')] + body(p) for p in range(1, 5)}
+    pages[4] = body(4)  # header on 3 of 4 pages
+    assert "ACME Corp Annual Report" not in kept_texts(make_lines(pages))
+
+
+def test_small_running_header_labelled_as_heading_is_dropped():
+    # The labeller's title-case rule tags short capitalized lines as headings regardless of size
+    pages = {p: [("ACME Corp Confidential Report", 20, 'h2', 9)] + body(p) for p in range(1, 5)}
+    assert "ACME Corp Confidential Report" not in kept_texts(make_lines(pages))
+
+
+def test_running_header_with_labeller_labels_is_dropped():
+    pages = {p: [("ACME Corp Confidential Report", 40, None, 9)] + body(p) for p in range(1, 5)}
+    pages[1] = [("Quarterly Results", 10, None, 24)] + pages[1]
+    labelled = assign_labels(make_lines(pages))
+    assert set(labelled.loc[labelled['text'] == "ACME Corp Confidential Report", 'label']) != {'paragraph'}
+
+    kept = kept_texts(labelled)
+    assert "ACME Corp Confidential Report" not in kept
+    assert "Quarterly Results" in kept
+
+
+def test_one_off_top_line_is_kept():
+    pages = {p: body(p) for p in range(1, 5)}
+    pages[2] = [("Only on this page", 20, 'paragraph')] + body(2)
+    assert "Only on this page" in kept_texts(make_lines(pages))
+
+
+def test_page_numbers_are_dropped():
+    pages = {p: body(p) + [(f"Page {p} of 4", 780, 'paragraph')] for p in range(1, 5)}
+    kept = kept_texts(make_lines(pages))
+    assert not any(t.startswith("Page ") for t in kept)
+
+
+def test_single_bare_number_in_margin_is_kept():
+    pages = {p: body(p) for p in range(1, 5)}
+    pages[3] = [("2024", 20, 'paragraph')] + body(3)
+    assert "2024" in kept_texts(make_lines(pages))
+
+
+def test_repeated_line_away_from_page_edge_is_kept():
+    # Inside the top band but below the first EDGE_LINES lines of the page
+    pages = {
+        p: [("Line A", 10, 'paragraph'), ("Line B", 30, 'paragraph'), ("Repeated note", 150, 'paragraph')] + body(p)
+        for p in range(1, 5)
+    }
+    kept = kept_texts(make_lines(pages))
+    assert "Repeated note" in kept
+
+
+def test_title_and_headings_are_kept():
+    pages = {p: [("Ingredients:", 20, 'h2', 14)] + body(p) for p in range(1, 5)}
+    pages[1] = [("Recipe Collection", 10, 'title')] + pages[1]
+    kept = kept_texts(make_lines(pages))
+    assert "Recipe Collection" in kept
+    assert "Ingredients:" in kept
+
+
+### Duplicate / Near-Duplicate Grouping ###
+def test_exact_duplicates_share_a_group():
+    groups, reps = group_duplicate_texts(["Hello world", "hello   WORLD", "Something else"])
+    assert groups == [0, 0, 1]
+    assert reps == [0, 2]
+
+
+def test_near_duplicates_share_a_group():
+    a = ("This document contains confidential and proprietary information of the company and may not be "
+         "copied distributed or disclosed to any third party without the prior written consent of the company "
+         "legal department or its authorised representatives")
+    b = a + " draft"
+    groups, reps = group_duplicate_texts([a, b])
+    assert groups == [0, 0]
+    assert reps == [0]
+
+
+def test_distinct_texts_stay_separate():
+    texts = [
+        "The museum opens at nine and offers guided tours of the old town every afternoon.",
+        "Trains to the coast leave hourly from the central station and take about forty minutes.",
+    ]
+    groups, reps = group_duplicate_texts(texts)
+    assert groups == [0, 1]
+    assert reps == [0, 1]
+
+
+def test_number_only_differences_stay_separate():
+    rng = random.Random(0)
+    words = "the tour visits old town market square harbour museum and lunch is served at a local restaurant".split()
+    for _ in range(200):
+        tokens = [rng.choice(words) for _ in range(35)]
+        a = " ".join(["Day", "3"] + tokens + ["costs", "45", "euros"])
+        b = " ".join(["Day", "4"] + tokens + ["costs", "80", "euros"])
+        groups, _ = group_duplicate_texts([a, b])
+        assert groups == [0, 1]
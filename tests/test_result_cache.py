@@ -0,0 +1,124 @@
+import io
+import json
+import os
+import time
+
+import pytest
+
+from api.result_cache import ResultCache, make_cache_key, remap_documents
+
+
+def make_entry(name="a.pdf"):
+    return {
+        "documents": {name: "hash-a"},
+        "input_documents": [name],
+        "extracted_sections": [{"document": name, "section_title": "Intro", "importance_rank": 1, "page_number": 1}],
+        "subsection_analysis": [{"document": name, "refined_text": "Body", "page_number": 1}],
+    }
+
+
+### Keys ###
+def test_key_ignores_order_case_and_whitespace():
+    a = make_cache_key(["h2", "h1"], " Travel  Planner ", "Plan a trip", "model", 5)
+    b = make_cache_key(["h1", "h2"], "travel planner", "plan a  TRIP", "model", 5)
+    assert a == b
+
+
+def test_key_depends_on_model_top_k_and_pdf_multiset():
+    base = make_cache_key(["h1"], "p", "j", "model", 5)
+    assert base != make_cache_key(["h1"], "p", "j", "other-model", 5)
+    assert base != make_cache_key(["h1"], "p", "j", "model", 3)
+    assert base != make_cache_key(["h1", "h1"], "p", "j", "model", 5)
+
+
+### Tiers ###
+def test_memory_tier_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path), capacity=2)
+    for key in ("k1", "k2"):
+        cache.put(key, make_entry())
+    cache.get("k1")
+    cache.put("k3", make_entry())
+
+    assert cache.stats()["memory_entries"] == 2
+    assert cache.get("k1") is not None
+    assert cache.get("k2") is not None  # evicted from memory, served from disk
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_disk_hit_is_promoted_to_memory(tmp_path):
+    ResultCache(str(tmp_path)).put("k", make_entry())
+    cache = ResultCache(str(tmp_path))
+
+    assert cache.get("k") == make_entry()
+    assert cache.get("k") == make_entry()
+    stats = cache.stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 0)
+
+
+def test_malformed_entry_is_a_miss_and_removed(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    path = tmp_path / "bad.json"
+    path.write_text(json.dumps({"extracted_sections": []}))
+
+    assert cache.get("bad") is None
+    assert not path.exists()
+    assert cache.stats()["misses"] == 1
+
+
+def test_disk_tier_prunes_oldest_entries(tmp_path):
+    cache = ResultCache(str(tmp_path), disk_capacity=2)
+    for i, key in enumerate(("old", "mid", "new")):
+        cache.put(key, make_entry())
+        os.utime(tmp_path / f"{key}.json", (time.time() - 100 + i, time.time() - 100 + i))
+    cache.put("newest", make_entry())
+
+    assert sorted(os.listdir(tmp_path)) == ["new.json", "newest.json"]
+
+
+### Remapping ###
+def test_remap_documents_uses_current_names():
+    entry = {
+        "documents": {"old.pdf": "hash-a", "x1.pdf": "hash-b", "x2.pdf": "hash-b"},
+        "input_documents": ["old.pdf", "x1.pdf", "x2.pdf"],
+        "extracted_sections": [{"document": "old.pdf"}],
+        "subsection_analysis": [{"document": "x2.pdf"}],
+    }
+    current = {"new.pdf": "hash-a", "y1.pdf": "hash-b", "y2.pdf": "hash-b"}
+
+    input_docs, sections, subsections = remap_documents(entry, current)
+    assert input_docs == ["new.pdf", "y1.pdf", "y2.pdf"]
+    assert sections == [{"document": "new.pdf"}]
+    assert subsections == [{"document": "y2.pdf"}]
+
+
+### Upload endpoint ###
+def test_upload_miss_then_hit_returns_same_result(tmp_path, monkeypatch):
+    pytest.importorskip("sentence_transformers")
+    pytest.importorskip("sklearn")
+    pytest.importorskip("fitz")
+    from api import app as app_module
+
+    def fake_pipeline(csv_path, persona, job, output_json_path):
+        output = make_entry()
+        app_module.generate_final_output(
+            output["input_documents"], persona, job,
+            output["extracted_sections"], output["subsection_analysis"], output_json_path
+        )
+
+    monkeypatch.setattr(app_module, "BASE_UPLOAD_FOLDER", str(tmp_path / "uploads"))
+    monkeypatch.setattr(app_module, "result_cache", ResultCache(str(tmp_path / "cache")))
+    monkeypatch.setattr(app_module, "process_folder", lambda *args: None)
+    monkeypatch.setattr(app_module, "process_unlabelled_csv", lambda *args: None)
+    monkeypatch.setattr(app_module, "run_pipeline", fake_pipeline)
+    client = app_module.app.test_client()
+
+    def upload():
+        data = {"persona": "Planner", "job": "Plan a trip", "pdfs": (io.BytesIO(b"%PDF-1.4 a"), "a.pdf")}
+        return client.post("/upload", data=data, content_type="multipart/form-data").get_json()
+
+    miss, hit = upload(), upload()
+    assert (miss["cache"], hit["cache"]) == ("miss", "hit")
+    miss_summary, hit_summary = json.loads(miss["summary"]), json.loads(hit["summary"])
+    for field in ("extracted_sections", "subsection_analysis"):
+        assert miss_summary[field] == hit_summary[field]
+    assert miss_summary["metadata"]["input_documents"] == hit_summary["metadata"]["input_documents"]